@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+import os
+import threading
+import weakref
+
+import metrics
+
+# Seeded when the Agents sheet is empty
+SAMPLE_AGENTS = [['John Doe', 'JD123'], ['Jane Smith', 'JS456']]
+
+# Per-process key so access codes are only held in memory as digests
+_CODE_KEY = os.urandom(32)
+
+
+def hash_code(code):
+    return hmac.new(_CODE_KEY, str(code).encode('utf-8'), hashlib.sha256).digest()
+
+
+# Name -> access code digests, built once per Agents sheet version
+class AgentDirectory:
+    def __init__(self, agents_df, version=None):
+        self.version = version
+        self.names = agents_df['Agent Name'].tolist()
+        self.codes = {}
+        for name, code in zip(agents_df['Agent Name'], agents_df['Agent Code']):
+            self.codes.setdefault(name, []).append(hash_code(code))
+
+    def __contains__(self, name):
+        return name in self.codes
+
+    def __len__(self):
+        return len(self.names)
+
+    def verify(self, name, code):
+        digest = hash_code(code)
+        return any(hmac.compare_digest(digest, known) for known in self.codes.get(name, ()))
+
+
+_lock = threading.Lock()
+_directories = weakref.WeakKeyDictionary()
+
+
+# Directory for a SheetStore, rebuilt only when the Agents sheet version changes
+def get_directory(store):
+    version = store.version(store.agents)
+    with _lock:
+        directory = _directories.get(store)
+        if directory is not None and directory.version == version:
+            metrics.cache_lookup("agent_directory", True)
+            return directory
+    metrics.cache_lookup("agent_directory", False)
+    version, agents_df = store.versioned_frame(store.agents)
+    directory = AgentDirectory(agents_df, version)
+    with _lock:
+        _directories[store] = directory
+    return directory
+
+
+# Fill an empty Agents sheet with the sample agents in one write
+def seed_sample_agents(store):
+    if len(get_directory(store)) == 0:
+        store.append_rows_chunked(store.agents, SAMPLE_AGENTS)
+    return get_directory(store)
@@ -0,0 +1,350 @@
+"""Headless HTTP API for dialer integrations.
+
+Runs next to the Streamlit app and shares its data-access layer (sheets.py):
+
+    python -m api --port 8502
+
+Endpoints (JSON in and out):
+
+    GET   /health
+    GET   /metrics                      Prometheus text: Sheets call spans, cache hits
+    GET   /agents                       agent names
+    POST  /agents                       {"agents": [{"name": ..., "code": ...}, ...]}
+    GET   /callbacks                    filters: agent, date, from, to, type, limit, offset
+    GET   /callbacks/due                callbacks due today (accepts the same filters)
+    GET   /callbacks/export.csv         streamed CSV of the filtered callbacks
+    POST  /callbacks                    {"callbacks": [{"Full Name": ..., ...}, ...]}, returns their ids
+    PATCH /callbacks                    {"updates": [{"id": "<Callback ID>", "fields": {"CB Type": "hot"}}, ...]}
+
+Each POST/PATCH batch costs one Sheets write call. Reads come from the shared
+worksheet cache, except that PATCH re-reads the target rows first and answers
+409 if one changed since. Address updates by Callback ID: row numbers shift
+whenever a callback is added ("row" is still accepted, but goes stale).
+
+Set HUNTER_API_TOKEN to require "Authorization: Bearer <token>".
+"""
+import argparse
+import datetime
+import hmac
+import json
+import os
+import tomllib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import gspread
+import pandas as pd
+
+import metrics
+from agents import get_directory
+from bulk import iter_csv_chunks, validate_callbacks
+from grid import filter_callbacks
+from sheets import CALLBACK_ID, CALLBACKS_HEADERS, RowConflict, SheetStore, connect, with_callback_ids
+
+DEFAULT_SECRETS_PATH = os.path.join(".streamlit", "secrets.toml")
+DEFAULT_LIMIT = 500
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+# Read the same service account the Streamlit app uses
+def load_service_account_info(path=DEFAULT_SECRETS_PATH):
+    with open(path, "rb") as f:
+        return tomllib.load(f)["gcp_service_account"]
+
+
+def _records(df):
+    # +2: one for the header line, one for 1-based sheet rows
+    return [dict(row=int(idx) + 2, **record) for idx, record in zip(df.index, df.to_dict("records"))]
+
+
+# A list of JSON objects from a request body field
+def _objects(body, key):
+    items = body.get(key, [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ApiError(400, f"{key} must be a list of objects")
+    return items
+
+
+# 422 details naming each rejected item the way the request did (keys[i] for
+# the i-th validated row), not by the file lines validate_callbacks reports in Row
+def _rejections(rejected, keys):
+    lines = rejected.pop("Row")
+    return [dict(keys[line - 2], **record) for line, record in zip(lines, rejected.to_dict("records"))]
+
+
+def query_callbacks(df, params, due_today=False):
+    if params.get("agent"):
+        df = df[df["Agent Name"] == params["agent"]]
+    if due_today:
+        params = dict(params, date=str(datetime.date.today()))
+    if params.get("date"):
+        df = df[df["CB Date"] == params["date"]]
+    start, end = params.get("from", ""), params.get("to")
+    date_range = (start, end) if end else ((start,) if start else ())
+    cb_types = [t for t in params.get("type", "").split(",") if t]
+    return filter_callbacks(df, date_range, cb_types)
+
+
+def create_callbacks(store, items):
+    agent_names = get_directory(store).names
+    incoming = pd.DataFrame([{col: item.get(col, "") for col in CALLBACKS_HEADERS} for item in items],
+                            columns=CALLBACKS_HEADERS)
+    valid, rejected = validate_callbacks(incoming, agent_names)
+    if not rejected.empty:
+        raise ApiError(422, "Some callbacks are invalid", _rejections(rejected, [{"item": i} for i in range(len(items))]))
+    rows = with_callback_ids(valid.values.tolist())
+    if rows:
+        # Newest first, like the Submit Callback form
+        store.insert_rows(store.callbacks, rows, index=2)
+    return [row[-1] for row in rows]
+
+
+# Sheet row (in the cached frame) of the callback an update names by "id" or "row"
+def _target_row(callbacks_df, update):
+    if "id" in update:
+        matches = (callbacks_df[CALLBACK_ID] == update["id"]).to_numpy().nonzero()[0]
+        if not len(matches):
+            raise ApiError(404, f"No callback with id {update['id']}")
+        return int(matches[0]) + 2
+    row_number = update.get("row")
+    if not isinstance(row_number, int) or not 2 <= row_number < len(callbacks_df) + 2:
+        raise ApiError(404, f"No callback at row {row_number}")
+    return row_number
+
+
+# Rows are re-checked against the sheet before writing (SheetStore.locate_rows):
+# a callback that moved is still updated in its new row, and one that changed
+# since this process last read it is refused with 409 rather than overwritten.
+def update_callbacks(store, updates):
+    callbacks_df = store.frame(store.callbacks)
+    agent_names = get_directory(store).names
+    merged, requested = {}, {}
+    for i, update in enumerate(updates):
+        row_number = _target_row(callbacks_df, update)
+        requested[row_number] = {"id": update["id"]} if "id" in update else {"row": row_number}
+        fields = update.get("fields", {})
+        if not isinstance(fields, dict):
+            raise ApiError(400, f"updates[{i}].fields must be an object")
+        unknown = set(fields) - set(CALLBACKS_HEADERS)
+        if unknown:
+            raise ApiError(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+        current = merged.get(row_number, callbacks_df.iloc[row_number - 2].to_dict())
+        merged[row_number] = dict(current, **fields)
+    if not merged:
+        return 0
+
+    valid, rejected = validate_callbacks(pd.DataFrame(list(merged.values()), columns=CALLBACKS_HEADERS), agent_names)
+    if not rejected.empty:
+        raise ApiError(422, "Some updates are invalid", _rejections(rejected, [requested[number] for number in merged]))
+    rows = {number: row + [merged[number][CALLBACK_ID]] for number, row in zip(merged, valid.values.tolist())}
+    expected = {number: callbacks_df.iloc[number - 2].tolist() for number in merged}
+    try:
+        store.update_rows(store.callbacks, rows, expected)
+    except RowConflict as e:
+        raise ApiError(409, f"{e}; fetch the callbacks again and retry")
+    return len(merged)
+
+
+def create_agents(store, items):
+    existing = set(get_directory(store).names)
+    rows = []
+    for item in items:
+        name, code = str(item.get("name", "")).strip(), str(item.get("code", "")).strip()
+        if not name or not code:
+            raise ApiError(422, "Every agent needs a name and a code")
+        if name in existing:
+            raise ApiError(409, f"Agent {name} already exists")
+        existing.add(name)
+        rows.append([name, code])
+    if rows:
+        store.append_rows_chunked(store.agents, rows)
+    return len(rows)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # Keep-alive so dialers can reuse one connection for many requests
+    protocol_version = "HTTP/1.1"
+    server_version = "HunterAgentsAPI/1.0"
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, content_type, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        except Exception as e:
+            # Too late for an error status: close without the final chunk, so
+            # the client sees a cut-off body instead of a complete file
+            self.log_error("Stream failed on %s %s: %r", self.command, self.path, e)
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _read_json(self):
+        length = self.headers.get("Content-Length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            # The body can't be skipped without a length, so the connection can't be reused
+            self.close_connection = True
+            raise ApiError(400, "Content-Length must be a non-negative integer")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, "Request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            raise ApiError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return body
+
+    def _check_auth(self):
+        token = self.server.token
+        if not token:
+            return
+        supplied = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise ApiError(401, "Missing or invalid API token")
+
+    def _dispatch(self, routes):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            handler = routes.get(url.path.rstrip("/") or "/")
+            if handler is None:
+                raise ApiError(404, f"No route for {self.command} {url.path}")
+            if url.path != "/health":
+                self._check_auth()
+            handler(params)
+        except ApiError as e:
+            payload = {"error": e.message}
+            if e.details is not None:
+                payload["details"] = e.details
+            self._send_json(e.status, payload)
+        except gspread.exceptions.APIError as e:
+            self._send_json(502, {"error": f"Sheets request failed: {e}"})
+        except Exception as e:
+            self.log_error("Unhandled error on %s %s: %r", self.command, self.path, e)
+            self._send_json(500, {"error": "Internal server error"})
+
+    def do_GET(self):
+        self._dispatch({
+            "/health": lambda params: self._send_json(200, {"status": "ok"}),
+            "/metrics": lambda params: self._send_text(200, metrics.render(), "text/plain; version=0.0.4; charset=utf-8"),
+            "/agents": self.get_agents,
+            "/callbacks": self.get_callbacks,
+            "/callbacks/due": lambda params: self.get_callbacks(params, due_today=True),
+            "/callbacks/export.csv": self.export_callbacks,
+        })
+
+    def do_POST(self):
+        self._dispatch({
+            "/agents": self.post_agents,
+            "/callbacks": self.post_callbacks,
+        })
+
+    def do_PATCH(self):
+        self._dispatch({
+            "/callbacks": self.patch_callbacks,
+        })
+
+    def get_agents(self, params):
+        self._send_json(200, {"agents": get_directory(self.store).names})
+
+    def get_callbacks(self, params, due_today=False):
+        matches = query_callbacks(self.store.frame(self.store.callbacks), params, due_today)
+        try:
+            offset = max(0, int(params.get("offset", 0)))
+            limit = max(0, int(params.get("limit", DEFAULT_LIMIT)))
+        except ValueError:
+            raise ApiError(400, "limit and offset must be integers")
+        self._send_json(200, {
+            "total": len(matches),
+            "offset": offset,
+            "callbacks": _records(matches.iloc[offset:offset + limit]),
+        })
+
+    def export_callbacks(self, params):
+        matches = query_callbacks(self.store.frame(self.store.callbacks), params)
+        self._send_stream("text/csv", iter_csv_chunks(matches))
+
+    def post_agents(self, params):
+        created = create_agents(self.store, _objects(self._read_json(), "agents"))
+        self._send_json(201, {"created": created})
+
+    def post_callbacks(self, params):
+        ids = create_callbacks(self.store, _objects(self._read_json(), "callbacks"))
+        self._send_json(201, {"created": len(ids), "ids": ids})
+
+    def patch_callbacks(self, params):
+        updated = update_callbacks(self.store, _objects(self._read_json(), "updates"))
+        self._send_json(200, {"updated": updated})
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store, token=None, verbose=False):
+        super().__init__(address, ApiHandler)
+        self.store = store
+        self.token = token
+        self.verbose = verbose
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hunter Agents headless API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--secrets", default=DEFAULT_SECRETS_PATH, help="Streamlit secrets.toml with gcp_service_account")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    store = SheetStore(connect(load_service_account_info(args.secrets)))
+    server = ApiServer((args.host, args.port), store, token=os.environ.get("HUNTER_API_TOKEN"), verbose=args.verbose)
+    print(f"Hunter Agents API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Static asset pipeline for the Streamlit app.
+
+Builds content-hashed files under static/, which Streamlit serves at
+app/static/ (see .streamlit/config.toml):
+
+    style.<hash>.css    minified styles/app.css, with local @font-face rules
+    logo.<hash>.webp    small sidebar logo (plus a .png fallback)
+    manifest.json       logical name -> hashed file name
+
+Run once at build/deploy time to also download the web fonts (the latin and
+latin-ext subsets):
+
+    python -m assets
+
+app.py calls build() at startup without network access; it reuses fonts that
+were already downloaded and falls back to the Google Fonts import otherwise.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import urllib.request
+
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+FONTS_DIR = os.path.join(STATIC_DIR, "fonts")
+FONTS_CSS = os.path.join(FONTS_DIR, "fonts.css")
+SOURCE_CSS = os.path.join(BASE_DIR, "styles", "app.css")
+SOURCE_LOGO = os.path.join(BASE_DIR, "hunter logo-02.jpg")
+MANIFEST = os.path.join(STATIC_DIR, "manifest.json")
+
+# URL prefix Streamlit serves the static folder under
+STATIC_URL = "app/static"
+
+GOOGLE_FONTS_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=Playfair+Display:wght@400;700;900&display=swap"
+# Google serves woff2 only to browsers it recognises
+FONTS_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+# latin-ext covers accented client names. Its faces carry a unicode-range, so
+# browsers only download those files for pages that use such characters.
+FONT_SUBSETS = ("latin", "latin-ext")
+
+# Sidebar shows the logo at 120px; 240px keeps it sharp on high-DPI screens
+LOGO_WIDTH = 240
+HASH_LENGTH = 12
+
+
+def _hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def _download(url):
+    request = urllib.request.Request(url, headers={"User-Agent": FONTS_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+# Download the Google Fonts files and write @font-face rules pointing at them
+def fetch_fonts():
+    os.makedirs(FONTS_DIR, exist_ok=True)
+    google_css = _download(GOOGLE_FONTS_URL).decode("utf-8")
+    faces = []
+    for subset, face in re.findall(r"/\* ([\w-]+) \*/\s*(@font-face\s*\{.*?\})", google_css, flags=re.S):
+        if subset not in FONT_SUBSETS:
+            continue
+        for url in re.findall(r"url\((https://[^)]+)\)", face):
+            file_name = os.path.basename(url)
+            path = os.path.join(FONTS_DIR, file_name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(_download(url))
+            # Relative to the stylesheet in static/
+            face = face.replace(url, f"fonts/{file_name}")
+        faces.append(face)
+    with open(FONTS_CSS, "w", encoding="utf-8") as f:
+        f.write("\n".join(faces))
+    return len(faces)
+
+
+def _write_once(path, data):
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def _remove_stale(prefix, keep):
+    for name in os.listdir(STATIC_DIR):
+        if name.startswith(prefix) and name not in keep:
+            os.remove(os.path.join(STATIC_DIR, name))
+
+
+def build_stylesheet():
+    if os.path.exists(FONTS_CSS):
+        with open(FONTS_CSS, encoding="utf-8") as f:
+            fonts = f.read()
+    else:
+        fonts = f"@import url('{GOOGLE_FONTS_URL}');"
+    with open(SOURCE_CSS, encoding="utf-8") as f:
+        css = minify_css(fonts + "\n" + f.read()).encode("utf-8")
+    name = f"style.{_hash(css)}.css"
+    _write_once(os.path.join(STATIC_DIR, name), css)
+    _remove_stale("style.", {name})
+    return name
+
+
+def build_logo():
+    with open(SOURCE_LOGO, "rb") as f:
+        version = _hash(f.read(), str(LOGO_WIDTH).encode())
+    names = {"logo": f"logo.{version}.webp", "logo_png": f"logo.{version}.png"}
+    if not all(os.path.exists(os.path.join(STATIC_DIR, name)) for name in names.values()):
+        with Image.open(SOURCE_LOGO) as image:
+            height = round(image.height * LOGO_WIDTH / image.width)
+            thumbnail = image.convert("RGB").resize((LOGO_WIDTH, height), Image.LANCZOS)
+        thumbnail.save(os.path.join(STATIC_DIR, names["logo"]), "WEBP", quality=85, method=6)
+        thumbnail.save(os.path.join(STATIC_DIR, names["logo_png"]), "PNG", optimize=True)
+    _remove_stale("logo.", set(names.values()))
+    return names
+
+
+# Build every asset that is missing or out of date and return the manifest
+def build(download_fonts=False):
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    if download_fonts:
+        fetch_fonts()
+    manifest = {"stylesheet": build_stylesheet(), **build_logo()}
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def asset_url(name):
+    return f"{STATIC_URL}/{name}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build Hunter Agents static assets")
+    parser.add_argument("--skip-fonts", action="store_true", help="Don't download web fonts")
+    args = parser.parse_args(argv)
+
+    manifest = build(download_fonts=not args.skip_fonts)
+    for key, name in manifest.items():
+        size = os.path.getsize(os.path.join(STATIC_DIR, name))
+        print(f"{key:12} {asset_url(name)} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""In-memory stand-in for the parts of gspread the app uses.
+
+FakeClient/FakeSpreadsheet/FakeWorksheet mirror the gspread methods called by
+sheets.py. Every call goes through a FakeBackend, which counts it by method,
+can add latency, and can raise the same 429 APIError that Google returns when
+the per-minute quota runs out.
+"""
+import collections
+import datetime
+import json
+import threading
+import time
+
+import gspread
+
+# Calls that count against the write quota, like on the real API
+WRITE_METHODS = {"append_row", "append_rows", "insert_row", "insert_rows", "update", "batch_update", "add_worksheet"}
+
+# Calls that go to the Drive API, which has its own quota
+DRIVE_METHODS = {"get_lastUpdateTime"}
+
+
+def method_kind(method):
+    if method in WRITE_METHODS:
+        return "write"
+    return "drive" if method in DRIVE_METHODS else "read"
+
+
+class FakeResponse:
+    def __init__(self, status, message):
+        self.status_code = status
+        self.text = json.dumps({"error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED"}})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeBackend:
+    """Shared call accounting for one fake spreadsheet.
+
+    latency is seconds per call, either a number or a {method: seconds} dict
+    (use the "default" key for everything else). read_quota/write_quota are
+    Sheets calls allowed per rolling minute; None means unlimited. Drive
+    calls (DRIVE_METHODS) are never limited.
+    """
+
+    def __init__(self, latency=0.0, read_quota=None, write_quota=None):
+        self.latency = latency
+        self.quotas = {"read": read_quota, "write": write_quota, "drive": None}
+        self.lock = threading.Lock()
+        self.calls = collections.Counter()
+        self.quota_errors = 0
+        self.history = {kind: collections.deque() for kind in self.quotas}
+        self.log = []
+
+    def _latency(self, method):
+        if isinstance(self.latency, dict):
+            return self.latency.get(method, self.latency.get("default", 0.0))
+        return self.latency
+
+    def call(self, method, worksheet=None):
+        kind = method_kind(method)
+        now = time.monotonic()
+        with self.lock:
+            quota = self.quotas[kind]
+            history = self.history[kind]
+            while history and now - history[0] >= 60:
+                history.popleft()
+            if quota is not None and len(history) >= quota:
+                self.quota_errors += 1
+                raise gspread.exceptions.APIError(FakeResponse(429, f"Quota exceeded for {kind} requests per minute"))
+            history.append(now)
+            self.calls[method] += 1
+            self.log.append((now, method, worksheet))
+        delay = self._latency(method)
+        if delay:
+            time.sleep(delay)
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.quota_errors = 0
+            self.log.clear()
+            for history in self.history.values():
+                history.clear()
+
+    def total_calls(self):
+        with self.lock:
+            return sum(self.calls.values())
+
+
+def _cell_row(a1):
+    return int("".join(ch for ch in a1 if ch.isdigit()))
+
+
+def _cell_column(a1):
+    column = 0
+    for ch in a1:
+        if ch.isalpha():
+            column = column * 26 + ord(ch.upper()) - ord("A") + 1
+    return column - 1
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, rows=None):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.rows = [list(map(str, row)) for row in rows or []]
+
+    @property
+    def backend(self):
+        return self.spreadsheet.backend
+
+    def _call(self, method):
+        self.backend.call(method, self.title)
+
+    def _written(self):
+        self.spreadsheet.touch()
+
+    def get_all_values(self):
+        self._call("get_all_values")
+        # The real API hands back freshly decoded lists on every call
+        return [list(row) for row in self.rows]
+
+    # Only the row span of each A1 range is honoured
+    def batch_get(self, ranges, **kwargs):
+        self._call("batch_get")
+        result = []
+        for range_name in ranges:
+            start, _, end = range_name.partition(":")
+            result.append([list(row) for row in self.rows[_cell_row(start) - 1:_cell_row(end or start)]])
+        return result
+
+    def append_row(self, values, **kwargs):
+        self._call("append_row")
+        self.rows.append([str(v) for v in values])
+        self._written()
+
+    def append_rows(self, values, **kwargs):
+        self._call("append_rows")
+        self.rows.extend([str(v) for v in row] for row in values)
+        self._written()
+
+    def insert_row(self, values, index=1, **kwargs):
+        self._call("insert_row")
+        self.rows.insert(index - 1, [str(v) for v in values])
+        self._written()
+
+    def insert_rows(self, values, row=1, **kwargs):
+        self._call("insert_rows")
+        self.rows[row - 1:row - 1] = [[str(v) for v in r] for r in values]
+        self._written()
+
+    def _set_row(self, range_name, values):
+        start = range_name.split(":")[0]
+        first_row, first_column = _cell_row(start), _cell_column(start)
+        for offset, row in enumerate(values):
+            while len(self.rows) < first_row + offset:
+                self.rows.append([])
+            target = self.rows[first_row + offset - 1]
+            target.extend([""] * (first_column + len(row) - len(target)))
+            target[first_column:first_column + len(row)] = [str(v) for v in row]
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self._call("update")
+        self._set_row(range_name, values)
+        self._written()
+
+    def batch_update(self, data, **kwargs):
+        self._call("batch_update")
+        for update in data:
+            self._set_row(update["range"], update["values"])
+        self._written()
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend=None, sheet_id="fake-sheet"):
+        self.backend = backend or FakeBackend()
+        self.id = sheet_id
+        self.sheets = {}
+        self.modified = 0
+
+    def touch(self):
+        self.modified += 1
+
+    def worksheet(self, title):
+        self.backend.call("worksheet", title)
+        if title not in self.sheets:
+            raise gspread.WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def worksheets(self):
+        self.backend.call("worksheets")
+        return list(self.sheets.values())
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        self.backend.call("add_worksheet", title)
+        self.sheets[title] = FakeWorksheet(self, title)
+        self.touch()
+        return self.sheets[title]
+
+    def get_lastUpdateTime(self):
+        self.backend.call("get_lastUpdateTime")
+        stamp = datetime.datetime(2025, 1, 1) + datetime.timedelta(seconds=self.modified)
+        return stamp.isoformat() + "Z"
+
+    # Seed a worksheet without going through (or counting) API calls
+    def load(self, title, rows):
+        self.sheets[title] = FakeWorksheet(self, title, rows)
+        self.touch()
+        return self.sheets[title]
+
+
+class FakeClient:
+    def __init__(self, backend=None):
+        self.backend = backend or FakeBackend()
+        self.spreadsheets = {}
+
+    def open_by_key(self, key):
+        self.backend.call("open_by_key")
+        if key not in self.spreadsheets:
+            self.spreadsheets[key] = FakeSpreadsheet(self.backend, key)
+        return self.spreadsheets[key]
@@ -0,0 +1,137 @@
+import contextlib
+import datetime
+import os
+import random
+import threading
+
+import streamlit as st
+import streamlit.config
+import streamlit.logger
+from streamlit.components.v2.component_manager import BidiComponentManager
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+import sheets
+from benchmarks.fake_gspread import FakeBackend, FakeSpreadsheet
+from sheets import AGENTS_HEADERS, CALLBACKS_SHEET_HEADERS
+
+# AppTest runs without a server runtime; silence the warnings about it
+streamlit.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+ADMIN_CODE = "admin1234"
+CB_TYPES = ["cold", "warm", "hot"]
+
+
+def agent_rows(count):
+    return [[f"Agent {i:03d}", f"CODE{i:03d}"] for i in range(count)]
+
+
+# Deterministic callbacks spread across agents and +/- 30 days around today
+def callback_rows(count, agents, seed=0):
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    rows = []
+    for i in range(count):
+        cb_date = today + datetime.timedelta(days=rng.randint(-30, 30))
+        dob = datetime.date(1940, 1, 1) + datetime.timedelta(days=rng.randint(0, 20000))
+        rows.append([
+            rng.choice(agents)[0], f"Client {i}", f"{rng.randint(1, 9999)} Main St", f"MCN{i:08d}",
+            str(dob), f"555-{rng.randint(1000000, 9999999)}", "Called back, wants a quote " * rng.randint(0, 4),
+            rng.choice(["", "Diabetes", "Hypertension", "Asthma"]), str(cb_date),
+            f"{rng.randint(9, 17)}:00", rng.choice(CB_TYPES), f"{rng.getrandbits(128):032x}",
+        ])
+    return rows
+
+
+def make_spreadsheet(callbacks=1000, agents=20, backend=None, seed=0):
+    spreadsheet = FakeSpreadsheet(backend or FakeBackend())
+    agent_list = agent_rows(agents)
+    spreadsheet.load("Agents", [AGENTS_HEADERS] + agent_list)
+    spreadsheet.load("Callbacks", [CALLBACKS_SHEET_HEADERS] + callback_rows(callbacks, agent_list, seed))
+    return spreadsheet
+
+
+# Point app.py at a fake spreadsheet and start from empty Streamlit caches
+@contextlib.contextmanager
+def fake_sheets(spreadsheet):
+    original = sheets.connect
+    sheets.connect = lambda service_account_info, sheet_id=sheets.SHEET_ID: spreadsheet
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    try:
+        yield spreadsheet
+    finally:
+        sheets.connect = original
+        st.cache_resource.clear()
+        st.cache_data.clear()
+
+
+# Each AppTest scans the metadata of every installed package for components on
+# its first run. A real server does that once, so share one registry: the scan
+# would otherwise dominate the memory and time of short visits.
+_component_manager = None
+_component_manager_lock = threading.Lock()
+
+
+def _shared_component_manager():
+    global _component_manager
+    with _component_manager_lock:
+        if _component_manager is None:
+            _component_manager = BidiComponentManager()
+            _component_manager.discover_and_register_components(start_file_watching=False)
+        return _component_manager
+
+
+def new_app(timeout=600, **session_state):
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app._bidi_component_manager = _shared_component_manager()
+    app.secrets["gcp_service_account"] = {}
+    for key, value in session_state.items():
+        app.session_state[key] = value
+    return app
+
+
+# The AppTest element with this label, e.g. widget(app.button, "Add Agent")
+def widget(widgets, label):
+    return next(element for element in widgets if element.label == label)
+
+
+# AppTest is written for one run at a time: each run installs a mock Runtime,
+# sets global.appTest, and undoes both when it finishes. When runs overlap in
+# threads, a finishing run would pull the runtime out from under the others
+# (forms then lose track of their ids), so keep both in place for the duration.
+# Each run also compiles app.py with its own ScriptCache, and Python 3.11's
+# compiler is not safe to call from several threads at once; share one
+# bytecode cache like the real server does.
+@contextlib.contextmanager
+def concurrent_app_runs():
+    original_exists, original_instance = Runtime.__dict__["exists"], Runtime.__dict__["instance"]
+    original_get_bytecode = ScriptCache.get_bytecode
+    last = {}
+    bytecode = {}
+    compile_lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in bytecode:
+                bytecode[script_path] = original_get_bytecode(self, script_path)
+            return bytecode[script_path]
+
+    def current(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+        return cls._instance or last.get("runtime")
+
+    Runtime.exists = classmethod(lambda cls: current(cls) is not None)
+    Runtime.instance = classmethod(current)
+    ScriptCache.get_bytecode = get_bytecode
+    streamlit.config.set_option("global.appTest", True)
+    try:
+        yield
+    finally:
+        Runtime.exists, Runtime.instance = original_exists, original_instance
+        ScriptCache.get_bytecode = original_get_bytecode
+        streamlit.config.set_option("global.appTest", False)
@@ -0,0 +1,238 @@
+"""Multi-session load test against the fake Sheets backend.
+
+Drives many concurrent AppTest sessions through the flows agents and admins
+actually use, then reports per-action latency percentiles, throughput and
+Sheets API calls per minute against the quota:
+
+    python -m benchmarks.load --sessions 40 --duration 120 --rows 10000
+    python -m benchmarks.load --sessions 10 --latency 0.3 --enforce-quota
+
+Agent sessions log in, submit a callback and edit one. Admin sessions log in
+and switch the agent filter. --admins sets the share of admin sessions.
+"""
+import argparse
+import collections
+import datetime
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks.fake_gspread import FakeBackend, method_kind
+from benchmarks.fixtures import ADMIN_CODE, agent_rows, concurrent_app_runs, fake_sheets, make_spreadsheet, new_app, widget
+from sheets import READ_QUOTA_PER_MINUTE, WRITE_QUOTA_PER_MINUTE, flush_all
+
+
+class Session:
+    def __init__(self, number, agents, rng, recorder):
+        self.number = number
+        self.agents = agents
+        self.rng = rng
+        self.recorder = recorder
+        self.app = new_app()
+
+    def step(self, action, prepare):
+        try:
+            prepare(self.app)
+        except Exception as e:
+            # The page didn't show what this step needs (e.g. a failed login)
+            self.recorder.record(action, 0.0, f"{action}: {e!r}")
+            return False
+        started = time.perf_counter()
+        error = None
+        try:
+            self.app.run()
+            if self.app.exception:
+                error = self.app.exception[0].message
+        except Exception as e:
+            error = repr(e)
+        self.recorder.record(action, time.perf_counter() - started, error)
+        return error is None
+
+    # Control hub -> login page -> dashboard
+    def agent_login(self):
+        name, code = self.rng.choice(self.agents)
+        self.step("open_app", lambda app: None)
+        self.step("open_login", lambda app: app.button(key="user_portal").click())
+
+        def login(app):
+            app.selectbox[0].select(name)
+            app.text_input[0].input(code)
+            app.button(key="login_submit").click()
+        return self.step("login", login)
+
+    def submit_callback(self):
+        def submit(app):
+            widget(app.text_input, "Full Name *").input(f"Load Client {self.number}-{self.rng.randint(0, 10**6)}")
+            widget(app.text_input, "Phone Number").input(f"555-{self.rng.randint(1000000, 9999999)}")
+            widget(app.date_input, "Callback Date *").set_value(datetime.date.today() + datetime.timedelta(days=self.rng.randint(0, 7)))
+            widget(app.selectbox, "Lead Temperature").select(self.rng.choice(["cold", "warm", "hot"]))
+            widget(app.button, "Submit Callback").click()
+        return self.step("submit_callback", submit)
+
+    def edit_callback(self):
+        if not any(button.label == "Update Callback" for button in self.app.button):
+            return True
+
+        def edit(app):
+            widget(app.text_input, "CB Timing").input(f"{self.rng.randint(9, 17)}:30")
+            widget(app.button, "Update Callback").click()
+        return self.step("edit_callback", edit)
+
+    def admin_login(self):
+        self.step("open_app", lambda app: None)
+        self.step("open_admin", lambda app: app.button(key="admin_dashboard").click())
+
+        def verify(app):
+            app.text_input[0].input(ADMIN_CODE)
+            app.button(key="admin_verify").click()
+        return self.step("admin_login", verify)
+
+    def switch_filter(self):
+        choice = self.rng.choice(["All Agents"] + [name for name, _ in self.agents])
+        return self.step("admin_filter", lambda app: widget(app.selectbox, "Select Agent").select(choice))
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = collections.defaultdict(list)
+        self.errors = collections.Counter()
+        self.error_messages = collections.Counter()
+
+    def record(self, action, seconds, error=None):
+        with self.lock:
+            self.samples[action].append(seconds)
+            if error:
+                self.errors[action] += 1
+                self.error_messages[error.splitlines()[0][:120]] += 1
+
+
+def run_session(number, args, agents, recorder, deadline):
+    rng = random.Random(args.seed + number)
+    is_admin = number < round(args.sessions * args.admins)
+    session = Session(number, agents, rng, recorder)
+    ok = session.admin_login() if is_admin else session.agent_login()
+    while ok and time.monotonic() < deadline:
+        if is_admin:
+            ok = session.switch_filter()
+        else:
+            ok = session.submit_callback() and session.edit_callback()
+        if args.think_time:
+            time.sleep(rng.uniform(0, 2 * args.think_time))
+
+
+def percentile(samples, q):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+# Runs shorter than a minute report their raw call count as the per-minute
+# figure; scaling a partial minute up would overstate it past the measured peak
+def api_usage(backend, started, finished):
+    minutes = max((finished - started) / 60, 1)
+    usage = {}
+    for kind, quota in (("read", READ_QUOTA_PER_MINUTE), ("write", WRITE_QUOTA_PER_MINUTE)):
+        stamps = [stamp for stamp, method, _ in backend.log if method_kind(method) == kind]
+        peak, window = 0, collections.deque()
+        for stamp in stamps:
+            window.append(stamp)
+            while stamp - window[0] >= 60:
+                window.popleft()
+            peak = max(peak, len(window))
+        usage[kind] = {"calls": len(stamps), "per_minute": round(len(stamps) / minutes, 1),
+                       "peak_per_minute": peak, "quota_per_minute": quota}
+    return usage
+
+
+def report(recorder, backend, started, finished):
+    elapsed = finished - started
+    actions = []
+    for action, samples in sorted(recorder.samples.items()):
+        actions.append({
+            "action": action,
+            "count": len(samples),
+            "errors": recorder.errors[action],
+            "p50_ms": round(percentile(samples, 50) * 1000, 1),
+            "p95_ms": round(percentile(samples, 95) * 1000, 1),
+            "p99_ms": round(percentile(samples, 99) * 1000, 1),
+        })
+    total = sum(a["count"] for a in actions)
+    return {
+        "duration_s": round(elapsed, 1),
+        "actions": actions,
+        "throughput_per_s": round(total / elapsed, 2) if elapsed else 0.0,
+        "api": api_usage(backend, started, finished),
+        "api_calls_by_method": dict(backend.calls),
+        "quota_errors": backend.quota_errors,
+        "error_messages": dict(recorder.error_messages.most_common(5)),
+    }
+
+
+def print_report(result):
+    header = f"{'action':18} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for a in result["actions"]:
+        print(f"{a['action']:18} {a['count']:>7} {a['errors']:>7} {a['p50_ms']:>9} {a['p95_ms']:>9} {a['p99_ms']:>9}")
+    print()
+    print(f"Duration:   {result['duration_s']} s")
+    print(f"Throughput: {result['throughput_per_s']} actions/s")
+    for kind, usage in result["api"].items():
+        print(f"API {kind + 's':6} {usage['calls']} calls, {usage['per_minute']}/min average, "
+              f"{usage['peak_per_minute']}/min peak (quota {usage['quota_per_minute']}/min)")
+    print(f"Quota errors: {result['quota_errors']}")
+    for message, count in result["error_messages"].items():
+        print(f"  {count} x {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent session load test against a fake Sheets backend")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent simulated sessions")
+    parser.add_argument("--admins", type=float, default=0.1, help="Share of sessions that are admins")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to keep sessions busy")
+    parser.add_argument("--rows", type=int, default=10_000, help="Callbacks in the fake sheet")
+    parser.add_argument("--agents", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds added to every fake API call")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between actions, seconds")
+    parser.add_argument("--enforce-quota", action="store_true", help="Fail API calls above the per-minute quota with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    backend = FakeBackend(
+        latency=args.latency,
+        read_quota=READ_QUOTA_PER_MINUTE if args.enforce_quota else None,
+        write_quota=WRITE_QUOTA_PER_MINUTE if args.enforce_quota else None,
+    )
+    recorder = Recorder()
+    with concurrent_app_runs(), fake_sheets(make_spreadsheet(args.rows, args.agents, backend, args.seed)):
+        backend.reset()
+        started = time.monotonic()
+        deadline = started + args.duration
+        threads = [
+            threading.Thread(target=run_session, args=(n, args, agent_rows(args.agents), recorder, deadline), daemon=True)
+            for n in range(args.sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Submits and edits are sent by a background writer; count the ones still queued
+        flush_all()
+        finished = time.monotonic()
+
+    result = report(recorder, backend, started, finished)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    if any(a["errors"] for a in result["actions"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Offline page benchmarks against the fake Sheets backend.
+
+Times every page of app.py at several callback table sizes and reports wall
+time, Sheets API calls and memory for a cold run (empty caches) and warm
+runs (caches filled by earlier sessions):
+
+    python -m benchmarks.pages                        # 1k/5k/10k rows
+    python -m benchmarks.pages --rows 1000 --latency 0.2
+    python -m benchmarks.pages --json results.json
+    python -m benchmarks.pages --compare baseline.json
+
+Memory is the peak Python heap (tracemalloc) plus the Arrow buffers a visit
+still holds when it ends. pandas keeps string columns in Arrow, which
+tracemalloc can't see, so a session that copies the callbacks frame shows
+up in the Arrow part.
+
+--compare exits non-zero when a page needs more API calls than the baseline,
+or is slower/larger by more than --tolerance, so CI can flag regressions.
+"""
+import argparse
+import gc
+import itertools
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pyarrow
+
+from benchmarks.fake_gspread import FakeBackend
+from benchmarks.fixtures import fake_sheets, make_spreadsheet, new_app, widget
+
+DEFAULT_ROWS = [1_000, 5_000, 10_000]
+DEFAULT_AGENTS = 20
+
+# Numbers for the agents admin_management adds, unique within the process
+_agent_numbers = itertools.count(1)
+
+
+def _login(app):
+    app.text_input[0].input("CODE000")
+    app.button(key="login_submit").click()
+
+
+def _add_agent(app):
+    number = next(_agent_numbers)
+    widget(app.text_input, "Agent Name *").input(f"Bench Agent {number}")
+    widget(app.text_input, "Access Code *").input(f"BENCH{number}")
+    widget(app.button, "Add Agent").click()
+
+
+# name -> (session state, untimed setup run needed, action before the timed run)
+PAGES = {
+    "control_hub": ({}, False, None),
+    "login": ({"page": "login"}, True, _login),
+    "agent_dashboard": ({"page": "agent_dashboard", "agent_name": "Agent 000"}, False, None),
+    "admin_analytics": ({"page": "admin", "admin_access": True}, False, None),
+    "admin_management": ({"page": "admin", "admin_access": True}, True, _add_agent),
+}
+
+
+def run_page(name, backend, trace_memory=False):
+    session_state, needs_setup, action = PAGES[name]
+    app = new_app(**session_state)
+    # API calls and memory cover the whole visit; wall time covers only the measured run
+    backend.reset()
+    if trace_memory:
+        # Free what earlier visits left behind, or it is credited against this one
+        gc.collect()
+        tracemalloc.start()
+        arrow_before = pyarrow.total_allocated_bytes()
+    if needs_setup:
+        app.run()
+    if action is not None:
+        action(app)
+    started = time.perf_counter()
+    app.run()
+    elapsed = time.perf_counter() - started
+    memory = 0
+    if trace_memory:
+        # Measured while the session is still alive, so its own copies count
+        memory = tracemalloc.get_traced_memory()[1] + max(pyarrow.total_allocated_bytes() - arrow_before, 0)
+        tracemalloc.stop()
+    if app.exception:
+        raise RuntimeError(f"{name} raised: {app.exception[0].message}")
+    return elapsed, backend.total_calls(), memory
+
+
+def bench_page(name, rows, agents, repeat, latency):
+    backend = FakeBackend(latency=latency)
+    with fake_sheets(make_spreadsheet(rows, agents, backend)):
+        cold_time, cold_calls, _ = run_page(name, backend)
+        warm = [run_page(name, backend) for _ in range(repeat)]
+    # Memory gets its own cold and warm visit: tracing slows down the runs it watches
+    backend = FakeBackend()
+    with fake_sheets(make_spreadsheet(rows, agents, backend)):
+        cold_memory = run_page(name, backend, trace_memory=True)[2]
+        warm_memory = run_page(name, backend, trace_memory=True)[2]
+    return {
+        "page": name,
+        "rows": rows,
+        "cold_ms": round(cold_time * 1000, 1),
+        "warm_ms": round(statistics.median(t for t, _, _ in warm) * 1000, 1),
+        "cold_api_calls": cold_calls,
+        "warm_api_calls": max(calls for _, calls, _ in warm),
+        "cold_mb": round(cold_memory / 1024 / 1024, 1),
+        "warm_mb": round(warm_memory / 1024 / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    previous = {(r["page"], r["rows"]): r for r in baseline}
+    failures = []
+    for result in results:
+        before = previous.get((result["page"], result["rows"]))
+        if before is None:
+            continue
+        label = f"{result['page']} @ {result['rows']} rows"
+        for key in ("cold_api_calls", "warm_api_calls"):
+            if result[key] > before[key]:
+                failures.append(f"{label}: {key} {before[key]} -> {result[key]}")
+        for key in ("warm_ms", "cold_mb", "warm_mb"):
+            if result[key] > before[key] * (1 + tolerance):
+                failures.append(f"{label}: {key} {before[key]} -> {result[key]}")
+    return failures
+
+
+def print_table(results):
+    header = f"{'page':18} {'rows':>8} {'cold ms':>9} {'warm ms':>9} {'cold calls':>10} {'warm calls':>10} {'cold MB':>8} {'warm MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['page']:18} {r['rows']:>8} {r['cold_ms']:>9} {r['warm_ms']:>9} "
+              f"{r['cold_api_calls']:>10} {r['warm_api_calls']:>10} {r['cold_mb']:>8} {r['warm_mb']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app.py pages against a fake Sheets backend")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Callback table sizes")
+    parser.add_argument("--agents", type=int, default=DEFAULT_AGENTS)
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Warm runs per page")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every fake API call")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to check against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/growth vs baseline")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        for page in args.pages:
+            result = bench_page(page, rows, args.agents, args.repeat, args.latency)
+            print(f"{page} @ {rows} rows: {result['warm_ms']} ms", file=sys.stderr)
+            results.append(result)
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        if failures:
+            print("\nRegressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
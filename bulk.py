@@ -0,0 +1,77 @@
+import pandas as pd
+
+from sheets import CALLBACKS_HEADERS
+
+CB_TYPES = ['cold', 'warm', 'hot']
+DATE_FORMAT = '%Y-%m-%d'
+
+# Rows rendered per CSV chunk during export
+EXPORT_CHUNK_ROWS = 5000
+
+
+# Read an uploaded CSV/Parquet file as plain strings, like get_all_values returns
+def read_upload(uploaded_file):
+    name = uploaded_file.name.lower()
+    if name.endswith('.parquet'):
+        df = pd.read_parquet(uploaded_file)
+    elif name.endswith('.csv'):
+        df = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    else:
+        raise ValueError("Upload a .csv or .parquet file")
+    df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+
+def _as_text(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.strftime(DATE_FORMAT).fillna('')
+    if pd.api.types.is_float_dtype(column):
+        # Parquet integer columns with gaps come back as floats: 5551234, not 5551234.0
+        column = column.astype(object).map(lambda value: str(int(value) if value.is_integer() else value), na_action='ignore')
+    return column.astype(object).where(column.notna(), '').astype(str).str.strip()
+
+
+# Validate a whole upload at once; returns (valid rows, rejected rows with reasons)
+def validate_callbacks(df, agent_names):
+    missing = [col for col in CALLBACKS_HEADERS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = pd.DataFrame({col: _as_text(df[col]) for col in CALLBACKS_HEADERS})
+    df['CB Type'] = df['CB Type'].str.lower().replace('', 'cold')
+
+    cb_date = pd.to_datetime(df['CB Date'], format=DATE_FORMAT, errors='coerce')
+    dob = pd.to_datetime(df['DOB'], format=DATE_FORMAT, errors='coerce')
+
+    checks = [
+        (df['Full Name'] == '', "Full Name is required"),
+        (df['CB Date'] == '', "CB Date is required"),
+        ((df['CB Date'] != '') & cb_date.isna(), "CB Date must be YYYY-MM-DD"),
+        ((df['DOB'] != '') & dob.isna(), "DOB must be YYYY-MM-DD"),
+        (~df['CB Type'].isin(CB_TYPES), "CB Type must be cold, warm or hot"),
+        (~df['Agent Name'].isin(agent_names), "Unknown agent"),
+    ]
+    problems = pd.Series('', index=df.index)
+    for mask, message in checks:
+        problems = problems.mask(mask, problems + message + '; ')
+
+    # Normalise valid dates so the edit form can parse them back
+    df['CB Date'] = cb_date.dt.strftime(DATE_FORMAT).fillna(df['CB Date'])
+    df['DOB'] = dob.dt.strftime(DATE_FORMAT).fillna(df['DOB'])
+
+    rejected = problems != ''
+    errors = df[rejected].copy()
+    errors.insert(0, 'Problems', problems[rejected].str.rstrip('; '))
+    # +2: one for the header line, one for 1-based file rows
+    errors.insert(0, 'Row', errors.index + 2)
+    return df[~rejected].reset_index(drop=True), errors.reset_index(drop=True)
+
+
+# Yield the export as encoded CSV chunks, header first. With positions, only
+# those rows are exported, copied out of df one chunk at a time
+def iter_csv_chunks(df, positions=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    total = len(df) if positions is None else len(positions)
+    yield df.head(0).to_csv(index=False).encode('utf-8')
+    for start in range(0, total, chunk_rows):
+        rows = slice(start, start + chunk_rows) if positions is None else positions[start:start + chunk_rows]
+        yield df.iloc[rows].to_csv(index=False, header=False).encode('utf-8')
@@ -0,0 +1,214 @@
+"""Analytics charts for the admin console.
+
+Charts are drawn with matplotlib from per-day counts that are aggregated once
+per callbacks snapshot (see dataset.py). The rendered PNGs are cached
+process-wide by (chart, selected agent, date range) along with the data
+version they were drawn from, so repeat views and switching back to an
+earlier selection draw nothing. A chart is only redrawn after the underlying
+sheet changes, and at most every CHART_REFRESH_SECONDS while agents keep
+submitting callbacks.
+"""
+import collections
+import io
+import threading
+import time
+import weakref
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+import metrics
+from bulk import CB_TYPES, DATE_FORMAT
+
+# Rendered charts kept across sessions; older entries are dropped first
+CHART_CACHE_SIZE = 64
+
+# While the data keeps changing, a chart may lag it by this much
+CHART_REFRESH_SECONDS = 30
+
+# Agents drawn individually on the per-day chart; the rest become "Other"
+TOP_AGENTS = 8
+RANKING_AGENTS = 15
+
+# Longer ranges are plotted per week instead of per day
+WEEKLY_AFTER_DAYS = 62
+
+# Same colours as the status badges in styles/app.css
+LEAD_COLORS = {'cold': '#ff6b6b', 'warm': '#ffd93d', 'hot': '#4caf50'}
+ACCENT_COLOR = '#00d4ff'
+OTHER_COLOR = '#4a5068'
+TEXT_COLOR = '#ffffffcc'
+GRID_COLOR = '#ffffff26'
+
+_lock = threading.Lock()
+_render_lock = threading.Lock()
+_counts = weakref.WeakKeyDictionary()
+_charts = collections.OrderedDict()
+
+
+# Callbacks per (date, agent, type), computed once per snapshot
+def daily_counts(snapshot):
+    with _lock:
+        counts = _counts.get(snapshot)
+    if counts is not None:
+        return counts
+    with metrics.timer("chart_aggregate"):
+        df = snapshot.df
+        counts = (
+            pd.DataFrame({
+                'date': pd.to_datetime(df['CB Date'], format=DATE_FORMAT, errors='coerce'),
+                'agent': df['Agent Name'],
+                'type': df['CB Type'],
+            })
+            .dropna(subset=['date'])
+            .groupby(['date', 'agent', 'type'])
+            .size()
+            .rename('count')
+            .reset_index()
+        )
+    with _lock:
+        _counts[snapshot] = counts
+    return counts
+
+
+def _select(counts, agent=None, date_range=()):
+    mask = pd.Series(True, index=counts.index)
+    if agent is not None:
+        mask &= counts['agent'] == agent
+    if len(date_range) >= 1:
+        mask &= counts['date'] >= pd.Timestamp(date_range[0])
+    if len(date_range) == 2:
+        mask &= counts['date'] <= pd.Timestamp(date_range[1])
+    return counts[mask]
+
+
+# Pivot counts to one row per day (or week) and one column per value of `by`
+def _timeline(counts, by):
+    table = counts.pivot_table(index='date', columns=by, values='count', aggfunc='sum', fill_value=0)
+    span = (table.index.max() - table.index.min()).days
+    return table.resample('W' if span > WEEKLY_AFTER_DAYS else 'D').sum()
+
+
+# Fixed margins leave room for the legend on the right; a tight bounding box
+# would lay the figure out twice on every save
+def _figure(title, width=6.4, height=3.6, margins=(0.09, 0.76, 0.22, 0.9)):
+    fig = Figure(figsize=(width, height))
+    left, right, bottom, top = margins
+    fig.subplots_adjust(left=left, right=right, bottom=bottom, top=top)
+    ax = fig.add_subplot()
+    ax.set_title(title, color=TEXT_COLOR, loc='left', fontsize=11, fontweight='bold')
+    ax.tick_params(colors=TEXT_COLOR, labelsize=8)
+    ax.grid(color=GRID_COLOR, linewidth=0.6)
+    ax.set_axisbelow(True)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    return fig, ax
+
+
+def _legend(ax):
+    legend = ax.legend(fontsize=7, frameon=False, loc='upper left', bbox_to_anchor=(1.0, 1.0))
+    for text in legend.get_texts():
+        text.set_color(TEXT_COLOR)
+
+
+def callbacks_per_day(counts, agent=None):
+    if agent is not None:
+        fig, ax = _figure("Callbacks per Day")
+        total = _timeline(counts, 'agent').sum(axis=1)
+        ax.plot(total.index, total, linewidth=1.5, color=ACCENT_COLOR)
+        fig.autofmt_xdate()
+        return fig
+    # Stacked so the top edge is the team total; the busiest agents get their own band
+    fig, ax = _figure("Callbacks per Day by Agent")
+    table = _timeline(counts, 'agent')
+    top = table.sum().nlargest(TOP_AGENTS).index
+    bands = [table[name] for name in top]
+    labels, colors = list(top), [f"C{i}" for i in range(len(top))]
+    if len(table.columns) > len(top):
+        bands.append(table.drop(columns=top).sum(axis=1))
+        labels.append("Other")
+        colors.append(OTHER_COLOR)
+    ax.stackplot(table.index, *bands, labels=labels, colors=colors, alpha=0.9)
+    _legend(ax)
+    fig.autofmt_xdate()
+    return fig
+
+
+def lead_mix(counts, agent=None):
+    fig, ax = _figure("Lead Temperature Mix (%)")
+    table = _timeline(counts, 'type').reindex(columns=CB_TYPES, fill_value=0)
+    share = table.div(table.sum(axis=1).where(lambda total: total > 0), axis=0).fillna(0) * 100
+    ax.stackplot(share.index, *(share[cb_type] for cb_type in CB_TYPES),
+                 labels=[cb_type.capitalize() for cb_type in CB_TYPES],
+                 colors=[LEAD_COLORS[cb_type] for cb_type in CB_TYPES], alpha=0.85)
+    ax.set_ylim(0, 100)
+    _legend(ax)
+    fig.autofmt_xdate()
+    return fig
+
+
+# Team-wide, so one drawing serves every agent selection
+def agent_ranking(counts, agent=None):
+    table = (counts.pivot_table(index='agent', columns='type', values='count', aggfunc='sum', fill_value=0)
+             .reindex(columns=CB_TYPES, fill_value=0))
+    table = table.loc[table.sum(axis=1).nlargest(RANKING_AGENTS).index[::-1]]
+    height = max(2.4, 0.32 * len(table) + 1)
+    fig, ax = _figure("Agent Ranking", width=12.8, height=height,
+                      margins=(0.1, 0.9, 0.35 / height, 1 - 0.4 / height))
+    left = pd.Series(0, index=table.index)
+    for cb_type in CB_TYPES:
+        ax.barh(table.index, table[cb_type], left=left, color=LEAD_COLORS[cb_type], label=cb_type.capitalize())
+        left += table[cb_type]
+    ax.grid(axis='y', visible=False)
+    _legend(ax)
+    return fig
+
+
+# name -> (drawing function, whether the chart covers only the selected agent)
+CHARTS = {
+    'per_day': (callbacks_per_day, True),
+    'lead_mix': (lead_mix, True),
+    'ranking': (agent_ranking, False),
+}
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=110, transparent=True)
+    return buffer.getvalue()
+
+
+# Cached PNG if it was drawn from this version or recently enough
+def _cached(key, version):
+    with _lock:
+        entry = _charts.get(key)
+        if entry is None:
+            return False, None
+        _charts.move_to_end(key)
+    drawn_version, drawn_at, png = entry
+    return drawn_version == version or time.monotonic() - drawn_at < CHART_REFRESH_SECONDS, png
+
+
+# PNG bytes for one chart, or None when nothing falls in the selection
+def get_chart(snapshot, name, agent=None, date_range=()):
+    draw, per_agent = CHARTS[name]
+    agent = agent if per_agent else None
+    key = (name, agent, tuple(str(day) for day in date_range))
+    found, png = _cached(key, snapshot.version)
+    metrics.cache_lookup("charts", found)
+    if found:
+        return png
+    # One drawing at a time; sessions asking for the same chart reuse it
+    with _render_lock:
+        found, png = _cached(key, snapshot.version)
+        if found:
+            return png
+        counts = _select(daily_counts(snapshot), agent, date_range)
+        with metrics.timer("chart_render", chart=name):
+            png = None if counts.empty else _png(draw(counts, agent))
+        with _lock:
+            _charts[key] = (snapshot.version, time.monotonic(), png)
+            _charts.move_to_end(key)
+            while len(_charts) > CHART_CACHE_SIZE:
+                _charts.popitem(last=False)
+    return png
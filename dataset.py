@@ -0,0 +1,208 @@
+"""Process-wide, read-only snapshots of the callbacks table.
+
+A CallbackSnapshot is built once per data version and shared by every
+session. Sessions keep integer row positions into it (an agent's rows, the
+rows matching the admin grid filters) and only materialise the rows they
+actually render, instead of each holding filtered copies of the whole table.
+
+Snapshots are never modified after they are built. When the sheet changes,
+get_snapshot() builds a new one; the old snapshot is freed as soon as the
+last rerun still holding it finishes. A change made through this process
+(SheetStore.insert_row_async/update_row_async) doesn't need a full rebuild:
+the next snapshot shifts the position arrays and updates only the changed
+agent's stats.
+"""
+import datetime
+import threading
+import weakref
+
+import numpy as np
+
+import metrics
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+_NO_ROWS = _readonly(np.array([], dtype=np.intp))
+
+# Lead quality score per CB Type; anything else counts as cold
+LEAD_SCORES = {'cold': 1, 'warm': 2, 'hot': 3}
+
+
+def lead_score(cb_type):
+    return LEAD_SCORES.get(cb_type, 1)
+
+
+def _with_position(positions, position):
+    return _readonly(np.insert(positions, np.searchsorted(positions, position), position))
+
+
+def _without_position(positions, position):
+    return _readonly(positions[positions != position])
+
+
+# An agent's dashboard numbers: callbacks, callbacks due today, lead quality
+class AgentStats:
+    def __init__(self, today, total=0, due_today=0, score_total=0):
+        self.today = today
+        self.total = total
+        self.due_today = due_today
+        self.score_total = score_total
+
+    @property
+    def rating(self):
+        return round(self.score_total / self.total, 1) if self.total else "N/A"
+
+    # Stats after taking one row away and/or adding one (rows as column -> value dicts)
+    def changed(self, removed=None, added=None):
+        stats = AgentStats(self.today, self.total, self.due_today, self.score_total)
+        for row, sign in ((removed, -1), (added, 1)):
+            if row is not None:
+                stats.total += sign
+                stats.due_today += sign * (row['CB Date'] == self.today)
+                stats.score_total += sign * lead_score(row['CB Type'])
+        return stats
+
+
+class CallbackSnapshot:
+    def __init__(self, df, version=None, agent_rows=None, stats=None):
+        self.version = version
+        self.df = df
+        self.all_rows = _readonly(np.arange(len(df), dtype=np.intp))
+        # Agent name -> positions of that agent's rows, in sheet order
+        if agent_rows is None:
+            agent_rows = {
+                name: _readonly(positions.astype(np.intp, copy=False))
+                for name, positions in df.groupby('Agent Name', sort=False).indices.items()
+            }
+        self.agent_rows = agent_rows
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.stats = stats or {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def positions(self, agent=None):
+        if agent is None:
+            return self.all_rows
+        return self.agent_rows.get(agent, _NO_ROWS)
+
+    # One column for the given rows only
+    def column(self, name, positions):
+        return self.df[name].iloc[positions]
+
+    def count(self, positions, column, value):
+        return int((self.column(column, positions) == value).sum())
+
+    # Materialise just these rows, keeping sheet positions as the index
+    def rows(self, positions, columns=None):
+        if columns is None:
+            return self.df.iloc[positions]
+        return self.df.iloc[positions, [self.df.columns.get_loc(col) for col in columns]]
+
+    # Full-table sort order for a column, computed once and shared
+    def order(self, column):
+        with self.lock:
+            order = self.orders.get(column)
+        if order is None:
+            order = _readonly(self.df[column].to_numpy().argsort(kind='stable'))
+            with self.lock:
+                self.orders[column] = order
+        return order
+
+    # Computed on first use per agent and day, then carried over by patched()
+    def agent_stats(self, agent):
+        today = str(datetime.date.today())
+        with self.lock:
+            stats = self.stats.get(agent)
+        if stats is None or stats.today != today:
+            positions = self.positions(agent)
+            stats = AgentStats(today, len(positions), self.count(positions, 'CB Date', today),
+                               sum(map(lead_score, self.column('CB Type', positions))))
+            with self.lock:
+                self.stats[agent] = stats
+        return stats
+
+    # The next version after local patches (see SheetStore.patches_since). Agents
+    # the patches don't touch keep their stats, and on edits their positions too.
+    def patched(self, df, version, patches):
+        columns = list(df.columns)
+        agent_rows = dict(self.agent_rows)
+        with self.lock:
+            stats = dict(self.stats)
+        for patch in patches:
+            row = dict(zip(columns, patch.row))
+            old_row = dict(zip(columns, patch.old_row)) if patch.old_row is not None else None
+            agent = row['Agent Name']
+            if patch.kind == 'insert':
+                agent_rows = {name: _readonly(rows + (rows >= patch.position)) for name, rows in agent_rows.items()}
+                agent_rows[agent] = _with_position(agent_rows.get(agent, _NO_ROWS), patch.position)
+            elif old_row['Agent Name'] != agent:
+                old_agent = old_row['Agent Name']
+                agent_rows[old_agent] = _without_position(agent_rows.get(old_agent, _NO_ROWS), patch.position)
+                agent_rows[agent] = _with_position(agent_rows.get(agent, _NO_ROWS), patch.position)
+            if old_row is not None and old_row['Agent Name'] in stats:
+                stats[old_row['Agent Name']] = stats[old_row['Agent Name']].changed(removed=old_row)
+            if agent in stats:
+                stats[agent] = stats[agent].changed(added=row)
+        return CallbackSnapshot(df, version, agent_rows, stats)
+
+    # positions, stably sorted by column, without sorting them again per session
+    def sorted_positions(self, column, positions):
+        order = self.order(column)
+        if len(positions) == len(self):
+            return order
+        member = np.zeros(len(self), dtype=bool)
+        member[positions] = True
+        return order[member[order]]
+
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_snapshots = weakref.WeakKeyDictionary()
+_live = weakref.WeakSet()
+
+metrics.set_gauge("callback_snapshots_live", lambda: len(_live))
+
+
+def _current(store, version):
+    with _lock:
+        snapshot = _snapshots.get(store)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    return None
+
+
+# Snapshot of a SheetStore's callbacks, rebuilt only when the sheet version changes
+def get_snapshot(store):
+    version = store.version(store.callbacks)
+    snapshot = _current(store, version)
+    metrics.cache_lookup("callback_snapshot", snapshot is not None)
+    if snapshot is not None:
+        return snapshot
+    # Build each version once, even when many sessions notice the change together
+    with _build_lock:
+        with _lock:
+            previous = _snapshots.get(store)
+        version, df = store.versioned_frame(store.callbacks)
+        if previous is not None and previous.version == version:
+            return previous
+        patches = previous is not None and store.patches_since(store.callbacks, previous.version, version)
+        if patches:
+            with metrics.timer("snapshot_build", kind="patch"):
+                snapshot = previous.patched(df, version, patches)
+        else:
+            with metrics.timer("snapshot_build", kind="full"):
+                snapshot = CallbackSnapshot(df, version)
+        with _lock:
+            _snapshots[store] = snapshot
+            _live.add(snapshot)
+    return snapshot
+
+
+def live_snapshots():
+    return len(_live)
@@ -0,0 +1,49 @@
+import math
+
+# Columns shown in the admin grid until the admin picks others
+DEFAULT_GRID_COLUMNS = ['Agent Name', 'Full Name', 'Number', 'CB Date', 'CB Timing', 'CB Type']
+PAGE_SIZES = [25, 50, 100]
+
+
+def _filter_mask(dates, types, date_range=(), cb_types=None):
+    mask = None
+    # CB Date is stored as YYYY-MM-DD text, so string comparison orders it correctly
+    if len(date_range) >= 1:
+        mask = dates >= str(date_range[0])
+    if len(date_range) == 2:
+        mask &= dates <= str(date_range[1])
+    if cb_types:
+        type_mask = types.isin(cb_types)
+        mask = type_mask if mask is None else mask & type_mask
+    return mask
+
+
+# Apply the grid filters before anything is serialized
+def filter_callbacks(df, date_range=(), cb_types=None):
+    mask = _filter_mask(df['CB Date'], df['CB Type'], date_range, cb_types)
+    return df if mask is None else df[mask]
+
+
+# Same filters over row positions in a shared CallbackSnapshot (see dataset.py)
+def filter_positions(snapshot, positions, date_range=(), cb_types=None):
+    if len(date_range) == 0 and not cb_types:
+        return positions
+    mask = _filter_mask(snapshot.column('CB Date', positions), snapshot.column('CB Type', positions), date_range, cb_types)
+    return positions[mask.to_numpy(dtype=bool)]
+
+
+def page_count(total_rows, page_size):
+    return max(1, math.ceil(total_rows / page_size))
+
+
+# Sort positions by a column and materialise one page of the visible columns only
+def get_page(snapshot, positions, columns, sort_by=None, ascending=True, page=1, page_size=PAGE_SIZES[0]):
+    page = min(max(1, page), page_count(len(positions), page_size))
+    start = (page - 1) * page_size
+    if sort_by:
+        ordered = snapshot.sorted_positions(sort_by, positions)
+        if not ascending:
+            ordered = ordered[::-1]
+    else:
+        ordered = positions
+    return snapshot.rows(ordered[start:start + page_size], columns)
@@ -0,0 +1,263 @@
+"""Process-wide timing metrics for the hot path.
+
+Records a span per Sheets API call (tagged by method, worksheet and
+read/write), cache hits and misses, DataFrame build time and the duration of
+every Streamlit rerun by page, including runs stopped early by a newer click,
+st.stop() or an error. Timers started while a rerun is in progress on the
+same thread are also added to that rerun's breakdown, so a slow click can be
+traced to the Sheets calls, quota waits or DataFrame builds inside it.
+
+The numbers are read three ways:
+
+    render()           Prometheus text format, served by serve() and by the
+                       API's GET /metrics
+    slowest_reruns()   recent reruns for the admin Performance panel
+    api_usage()        Sheets calls made in the last minute, by read/write
+
+Set HUNTER_METRICS_PORT to serve /metrics from the Streamlit process.
+"""
+import collections
+import contextlib
+import datetime
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+PREFIX = "hunter"
+
+# Reruns kept for the Performance panel
+RECENT_RERUNS = 500
+
+# Rolling window for Sheets usage, matching the per-minute quota
+USAGE_WINDOW_SECONDS = 60
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters = collections.Counter()
+_timings = {}
+_gauges = {}
+_calls = collections.deque()
+_reruns = collections.deque(maxlen=RECENT_RERUNS)
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def count(name, value=1, **labels):
+    with _lock:
+        _counters[_key(name, labels)] += value
+
+
+# value may be a function, called each time the metrics are rendered
+def set_gauge(name, value, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        timing = _timings.setdefault(key, [0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+    rerun = _current_rerun()
+    if rerun is not None:
+        rerun.add(name, seconds)
+
+
+@contextlib.contextmanager
+def timer(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def cache_lookup(cache, hit):
+    count("cache_lookups", cache=cache, result="hit" if hit else "miss")
+
+
+# Span around one Sheets API call; failures are counted by status code
+@contextlib.contextmanager
+def api_call(method, worksheet, kind):
+    labels = {"method": method, "worksheet": worksheet, "kind": kind}
+    now = time.monotonic()
+    with _lock:
+        _calls.append((now, kind))
+        _prune_calls(now)
+    try:
+        with timer("sheets_api_call", **labels):
+            yield
+    except Exception as e:
+        count("sheets_api_errors", code=getattr(e, "code", None) or type(e).__name__, **labels)
+        raise
+
+
+def _prune_calls(now):
+    while _calls and now - _calls[0][0] >= USAGE_WINDOW_SECONDS:
+        _calls.popleft()
+
+
+def api_usage():
+    with _lock:
+        _prune_calls(time.monotonic())
+        usage = collections.Counter(kind for _, kind in _calls)
+    return {"read": usage["read"], "write": usage["write"]}
+
+
+class Rerun:
+    def __init__(self, page):
+        self.page = page
+        self.started = datetime.datetime.now()
+        self.seconds = None
+        self.interrupted = False
+        self.breakdown = {}
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds):
+        spent = self.breakdown.setdefault(name, [0, 0.0])
+        spent[0] += 1
+        spent[1] += seconds
+
+    def calls(self, name):
+        return self.breakdown.get(name, (0, 0.0))[0]
+
+    def spent(self, name):
+        return self.breakdown.get(name, (0, 0.0))[1]
+
+    # Safe to call more than once; only the first call is recorded.
+    # interrupted marks a run Streamlit stopped before the end of the script.
+    def finish(self, interrupted=False):
+        if self.seconds is not None:
+            return
+        self.seconds = time.perf_counter() - self._start
+        self.interrupted = interrupted
+        observe("rerun", self.seconds, page=self.page)
+        if interrupted:
+            count("reruns_interrupted", page=self.page)
+        with _lock:
+            _reruns.append(self)
+
+
+# The rerun in progress on a thread. Streamlit runs a session's reruns on one
+# thread until the script ends, then lets the thread exit. A run stopped by a
+# newer click is finished by the next start_rerun on the same thread; a run
+# stopped by st.stop() or an error never gets there, so it is finished when
+# the thread exits and its locals (this object) are freed.
+class _Running:
+    def __init__(self, rerun):
+        self.rerun = rerun
+        weakref.finalize(self, rerun.finish, True)
+
+
+def _current_rerun():
+    running = getattr(_local, "running", None)
+    if running is None or running.rerun.seconds is not None:
+        return None
+    return running.rerun
+
+
+def start_rerun(page):
+    previous = _current_rerun()
+    if previous is not None:
+        previous.finish(interrupted=True)
+    rerun = Rerun(page)
+    _local.running = _Running(rerun)
+    return rerun
+
+
+def slowest_reruns(limit=10):
+    with _lock:
+        reruns = list(_reruns)
+    return sorted(reruns, key=lambda rerun: rerun.seconds, reverse=True)[:limit]
+
+
+# Totals per label set for one timer, e.g. timing_stats("sheets_api_call")
+def timing_stats(name):
+    with _lock:
+        return [(dict(labels), calls, seconds) for (key, labels), (calls, seconds) in _timings.items() if key == name]
+
+
+def counter_stats(name):
+    with _lock:
+        return [(dict(labels), value) for (key, labels), value in _counters.items() if key == name]
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+        _calls.clear()
+        _reruns.clear()
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name, labels, value):
+    if labels:
+        name += "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+    return f"{name} {value}"
+
+
+def _family(lines, name, kind, samples):
+    lines.append(f"# TYPE {name} {kind}")
+    lines.extend(samples)
+
+
+# Everything recorded so far in the Prometheus text exposition format
+def render():
+    with _lock:
+        counters = sorted(_counters.items())
+        timings = sorted(_timings.items())
+        gauges = sorted(_gauges.items())
+        _prune_calls(time.monotonic())
+        recent = collections.Counter(kind for _, kind in _calls)
+    lines = []
+    for name in sorted({key for (key, _), _ in counters}):
+        full = f"{PREFIX}_{name}_total"
+        _family(lines, full, "counter", [_sample(full, labels, value) for (key, labels), value in counters if key == name])
+    for name in sorted({key for (key, _), _ in timings}):
+        full = f"{PREFIX}_{name}_seconds"
+        samples = []
+        for (key, labels), (calls, seconds) in timings:
+            if key == name:
+                samples.append(_sample(f"{full}_count", labels, calls))
+                samples.append(_sample(f"{full}_sum", labels, float(seconds)))
+        _family(lines, full, "summary", samples)
+    for name in sorted({key for (key, _), _ in gauges}):
+        full = f"{PREFIX}_{name}"
+        _family(lines, full, "gauge", [_sample(full, labels, value() if callable(value) else value)
+                                       for (key, labels), value in gauges if key == name])
+    full = f"{PREFIX}_sheets_api_calls_last_minute"
+    _family(lines, full, "gauge", [_sample(full, (("kind", kind),), recent[kind]) for kind in ("read", "write")])
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if urlsplit(self.path).path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Serve GET /metrics from a background thread of this process
+def serve(port, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
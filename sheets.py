@@ -0,0 +1,517 @@
+import collections
+import hashlib
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from google.oauth2.service_account import Credentials
+import gspread
+import pandas as pd
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Setup Google Sheets connection
+SCOPE = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+SHEET_ID = "1PzBTiG0XkMOlnq0o-rO80_tg252nxtxOt5-aX1h0ivc"
+
+# Sheet layouts. CALLBACKS_HEADERS are the fields forms and uploads fill in; the
+# Callbacks sheet also carries a generated ID in its last column, so a callback
+# can be found again after inserts above it have moved it to another row.
+AGENTS_HEADERS = ['Agent Name', 'Agent Code']
+CALLBACKS_HEADERS = ['Agent Name', 'Full Name', 'Address', 'MCN', 'DOB', 'Number', 'Notes', 'Medical Conditions', 'CB Date', 'CB Timing', 'CB Type']
+CALLBACK_ID = 'Callback ID'
+CALLBACKS_SHEET_HEADERS = CALLBACKS_HEADERS + [CALLBACK_ID]
+
+# Google Sheets allows 60 read and 60 write requests per minute per user
+READ_QUOTA_PER_MINUTE = 60
+WRITE_QUOTA_PER_MINUTE = 60
+
+# Modified-time lookups go to the Drive API, which has its own, far larger quota
+DRIVE_QUOTA_PER_MINUTE = 12000
+
+# Rows sent per append_rows call during bulk writes
+APPEND_CHUNK_ROWS = 500
+
+# Retries for a call that hits the quota anyway (e.g. another process writing)
+QUOTA_RETRIES = 5
+
+# Seconds between checks of the spreadsheet's modified time
+VERSION_CHECK_SECONDS = 15
+
+# Seconds between re-reads of worksheets versioned by their own content
+CONTENT_CHECK_SECONDS = 60
+
+# Keep-alive connections held open to the Google APIs
+CONNECTION_POOL_SIZE = 20
+
+# Recent local patches kept so caches built on a cached frame can catch up
+PATCH_HISTORY = 32
+
+
+# Token bucket shared by every session in the process
+class RateLimiter:
+    def __init__(self, per_minute, kind):
+        self.kind = kind
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+read_limiter = RateLimiter(READ_QUOTA_PER_MINUTE, "read")
+write_limiter = RateLimiter(WRITE_QUOTA_PER_MINUTE, "write")
+drive_limiter = RateLimiter(DRIVE_QUOTA_PER_MINUTE, "drive")
+metrics.set_gauge("sheets_quota_per_minute", READ_QUOTA_PER_MINUTE, kind="read")
+metrics.set_gauge("sheets_quota_per_minute", WRITE_QUOTA_PER_MINUTE, kind="write")
+metrics.set_gauge("sheets_quota_per_minute", DRIVE_QUOTA_PER_MINUTE, kind="drive")
+
+
+# Open the Google Sheet with a pooled, keep-alive HTTP session
+def connect(service_account_info, sheet_id=SHEET_ID):
+    # Fix private_key formatting (replace \n with real newlines)
+    service_account_info = dict(service_account_info)
+    if isinstance(service_account_info.get("private_key"), str):
+        service_account_info["private_key"] = service_account_info["private_key"].replace("\\n", "\n")
+
+    creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPE)
+    client = gspread.authorize(creds)
+    adapter = HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE)
+    client.http_client.session.mount("https://", adapter)
+    return client.open_by_key(sheet_id)
+
+
+# Function to create sheet if not exists
+def create_sheet_if_not_exists(sheet, sheet_name, headers):
+    try:
+        worksheet = sheet.worksheet(sheet_name)
+    except gspread.WorksheetNotFound:
+        worksheet = sheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
+        worksheet.append_row(headers)
+    return worksheet
+
+
+def new_callback_id():
+    return uuid.uuid4().hex
+
+
+# Rows of CALLBACKS_HEADERS values with a new Callback ID appended to each
+def with_callback_ids(rows):
+    return [list(row) + [new_callback_id()] for row in rows]
+
+
+# A write targeted a row that no longer holds the values it was read with
+class RowConflict(Exception):
+    pass
+
+
+def values_to_df(data):
+    return pd.DataFrame(data[1:], columns=data[0]) if len(data) > 1 else pd.DataFrame(columns=data[0])
+
+
+# Function to get data as DataFrame
+def get_df(worksheet):
+    return values_to_df(worksheet.get_all_values())
+
+
+def _is_quota_error(error):
+    return error.code == 429
+
+
+# Method name and worksheet (or spreadsheet) title for a bound gspread call
+def _describe(fn):
+    return fn.__name__, getattr(getattr(fn, "__self__", None), "title", "")
+
+
+# Run one API call under a limiter, backing off if the quota is hit anyway
+def call_with_quota(limiter, fn, *args, **kwargs):
+    method, worksheet = _describe(fn)
+    for attempt in range(QUOTA_RETRIES + 1):
+        with metrics.timer("sheets_quota_wait", kind=limiter.kind):
+            limiter.acquire()
+        try:
+            with metrics.api_call(method, worksheet, limiter.kind):
+                return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if not _is_quota_error(e) or attempt == QUOTA_RETRIES:
+                raise
+            time.sleep(2 ** attempt)
+
+
+# Append rows in chunks, one rate-limited API call per chunk
+def append_rows_chunked(worksheet, rows, chunk_size=APPEND_CHUNK_ROWS, on_progress=None):
+    total = len(rows)
+    for start in range(0, total, chunk_size):
+        call_with_quota(write_limiter, worksheet.append_rows, rows[start:start + chunk_size])
+        if on_progress is not None:
+            on_progress(min(start + chunk_size, total), total)
+    return total
+
+
+def row_range(row_number, width=len(CALLBACKS_SHEET_HEADERS)):
+    return f"A{row_number}:{chr(ord('A') + width - 1)}{row_number}"
+
+
+def _padded(row, width):
+    return (list(row) + [''] * width)[:width]
+
+
+# One row inserted or replaced in a cached frame ahead of the Sheets write.
+# position is 0-based in the frame (sheet row - 2); old_row is the replaced row.
+class Patch:
+    def __init__(self, base, version, kind, position, row, old_row=None):
+        self.base = base
+        self.version = version
+        self.kind = kind
+        self.position = position
+        self.row = row
+        self.old_row = old_row
+
+
+# An update only patches a cached frame that still holds old_row at position
+def _can_patch(df, kind, position, row, old_row=None):
+    last = len(df) - 1 if kind == 'update' else len(df)
+    if len(row) != len(df.columns) or not 0 <= position <= last:
+        return False
+    return old_row is None or df.iloc[position].tolist() == old_row
+
+
+def _patch_frame(df, kind, position, row):
+    new_row = pd.DataFrame([row], columns=df.columns)
+    rest = position + 1 if kind == 'update' else position
+    return pd.concat([df.iloc[:position], new_row, df.iloc[rest:]], ignore_index=True)
+
+
+# Spreadsheet handle plus a process-wide cache of worksheet DataFrames.
+# A cached frame is reused until the data version changes: either a write made
+# through this store, or a new modified time reported by Drive (another process
+# or a manual edit). Cached frames are shared between callers and must not be
+# modified in place.
+#
+# Drive's modified time covers the whole spreadsheet, so every callback write
+# would also expire the Agents frame. Worksheets in content_versioned (Agents)
+# are instead versioned by a hash of their values, re-read at most every
+# CONTENT_CHECK_SECONDS; writes to other worksheets don't touch them.
+#
+# insert_row_async/update_row_async patch the cached frame straight away and
+# send the write from a single background thread, in order. The new version
+# stays in the cache, so showing the change costs no read; if the write fails,
+# the worksheet is invalidated and re-read on next use. The writer also reads
+# the modified time before and after each write: when nothing else changed the
+# spreadsheet in between, the new time is recorded as seen, so the next poll
+# doesn't re-read the sheet for our own write. (A change someone else makes
+# during the write itself can't be told apart from ours.)
+class SheetStore:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self.agents = create_sheet_if_not_exists(spreadsheet, "Agents", AGENTS_HEADERS)
+        self.callbacks = create_sheet_if_not_exists(spreadsheet, "Callbacks", CALLBACKS_SHEET_HEADERS)
+        self.lock = threading.Lock()
+        self.fetch_locks = {}
+        self.frames = {}
+        self.local_writes = {}
+        self.remote_modified = None
+        self.remote_epoch = 0
+        self.remote_checked = 0.0
+        self.content_versioned = {self.agents.title}
+        self.digests = {}
+        self.digest_lock = threading.Lock()
+        self.patches = {}
+        self.pending = collections.Counter()
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-writer")
+        _stores.add(self)
+
+    # Counts modified times from Drive that no background write accounted for
+    def _remote_version(self):
+        with self.lock:
+            fresh = time.monotonic() - self.remote_checked < VERSION_CHECK_SECONDS
+            if not fresh:
+                # Claim this check so concurrent callers keep using the current value
+                self.remote_checked = time.monotonic()
+        metrics.cache_lookup("modified_time", fresh)
+        if fresh:
+            return self.remote_epoch
+        modified = call_with_quota(drive_limiter, self.spreadsheet.get_lastUpdateTime)
+        with self.lock:
+            if modified != self.remote_modified:
+                self.remote_modified = modified
+                self.remote_epoch += 1
+            return self.remote_epoch
+
+    # Hash of the worksheet's values as of the last read, re-read when stale
+    def _content_version(self, worksheet):
+        title = worksheet.title
+        with self.lock:
+            checked, digest = self.digests.get(title, (0.0, None))
+            fresh = time.monotonic() - checked < CONTENT_CHECK_SECONDS
+            if not fresh and digest is not None:
+                # Claim this check so concurrent callers keep using the current digest
+                self.digests[title] = (time.monotonic(), digest)
+            local = self.local_writes.get(title, 0)
+        metrics.cache_lookup("content_hash", fresh)
+        if fresh:
+            return digest
+        if digest is None:
+            # First read: one caller reads, the rest wait for its digest
+            with self.digest_lock:
+                with self.lock:
+                    digest = self.digests.get(title, (0.0, None))[1]
+                if digest is None:
+                    digest = self._read(worksheet, (None, local))[0][0]
+            return digest
+        return self._read(worksheet, (None, local))[0][0]
+
+    def version(self, worksheet):
+        if worksheet.title in self.content_versioned:
+            remote = self._content_version(worksheet)
+        else:
+            remote = self._remote_version()
+        with self.lock:
+            return (remote, self.local_writes.get(worksheet.title, 0))
+
+    # Read a worksheet into the cache. version is (remote, local) as of before
+    # the read; for content-versioned worksheets remote becomes the new digest,
+    # and an unchanged digest keeps the cached frame.
+    def _read(self, worksheet, version):
+        title = worksheet.title
+        data = call_with_quota(read_limiter, worksheet.get_all_values)
+        if title == self.callbacks.title:
+            data = self._assign_callback_ids(worksheet, data)
+        if title in self.content_versioned:
+            digest = hashlib.sha256(repr(data).encode('utf-8')).hexdigest()
+            version = (digest, version[1])
+            with self.lock:
+                self.digests[title] = (time.monotonic(), digest)
+                cached = self.frames.get(title)
+            if cached is not None and cached[0] == version:
+                return cached
+        with metrics.timer("dataframe_build", worksheet=title):
+            df = values_to_df(data)
+        with self.lock:
+            self.frames[title] = (version, df)
+        return version, df
+
+    # (version, frame) for a worksheet, fetched only when the version changed
+    def versioned_frame(self, worksheet):
+        title = worksheet.title
+        version = self.version(worksheet)
+        with self.lock:
+            cached = self.frames.get(title)
+            fetch_lock = self.fetch_locks.setdefault(title, threading.Lock())
+        if cached is not None and cached[0] == version:
+            metrics.cache_lookup("worksheet_frames", True)
+            return cached
+        # One fetch per worksheet at a time; waiters reuse its result
+        with fetch_lock:
+            with self.lock:
+                cached = self.frames.get(title)
+            if cached is not None and cached[0] == version:
+                metrics.cache_lookup("worksheet_frames", True)
+                return cached
+            metrics.cache_lookup("worksheet_frames", False)
+            # Let queued writes land first so the fetch includes them
+            if self.pending[title]:
+                self.flush()
+                version = self.version(worksheet)
+            return self._read(worksheet, version)
+
+    def frame(self, worksheet):
+        return self.versioned_frame(worksheet)[1]
+
+    # Give callbacks without an ID one, in a single write: every row the first
+    # time a sheet from before IDs is read, later only rows typed into the sheet
+    # by hand. Returns the values as they are after the write.
+    def _assign_callback_ids(self, worksheet, data):
+        if not data:
+            return data
+        header, updates = data[0], []
+        if CALLBACK_ID not in header:
+            header.append(CALLBACK_ID)
+            updates.append({'range': f"{chr(ord('A') + len(header) - 1)}1", 'values': [[CALLBACK_ID]]})
+        column = header.index(CALLBACK_ID)
+        letter = chr(ord('A') + column)
+        for number, row in enumerate(data[1:], start=2):
+            row.extend([''] * (len(header) - len(row)))
+            if not row[column]:
+                row[column] = new_callback_id()
+                updates.append({'range': f"{letter}{number}", 'values': [[row[column]]]})
+        if updates:
+            call_with_quota(write_limiter, worksheet.batch_update, updates)
+        return data
+
+    # Current row numbers for rows last read at the given numbers with the given
+    # values ({row number: values}). Rows still in place cost one read for the
+    # whole batch. Rows that moved (inserts above them) are found by their
+    # values, which include the Callback ID, in one full read. A row changed or
+    # deleted since raises RowConflict. This narrows the window for positional
+    # writes to the gap between this read and the write that follows it.
+    def locate_rows(self, worksheet, expected):
+        numbers = list(expected)
+        found = call_with_quota(read_limiter, worksheet.batch_get,
+                                [row_range(number, len(expected[number])) for number in numbers])
+        located = {number: number for number in numbers}
+        moved = [number for number, values in zip(numbers, found)
+                 if _padded(values[0] if values else [], len(expected[number])) != expected[number]]
+        if not moved:
+            return located
+        data = call_with_quota(read_limiter, worksheet.get_all_values)
+        for number in moved:
+            old_row = expected[number]
+            matches = [n for n, row in enumerate(data[1:], start=2) if _padded(row, len(old_row)) == old_row]
+            if len(matches) != 1:
+                # Our copy of this worksheet is out of date; re-read it on next use
+                self.invalidate(worksheet)
+                raise RowConflict(f"Row {number} was changed or removed since it was read")
+            located[number] = matches[0]
+        return located
+
+    # Local patches that lead from version base to version target, or None
+    def patches_since(self, worksheet, base, target):
+        with self.lock:
+            history = list(self.patches.get(worksheet.title, ()))
+        chain = []
+        for patch in history:
+            if patch.base == (chain[-1].version if chain else base):
+                chain.append(patch)
+                if patch.version == target:
+                    return chain
+        return None
+
+    def invalidate(self, worksheet):
+        with self.lock:
+            self.local_writes[worksheet.title] = self.local_writes.get(worksheet.title, 0) + 1
+
+    def _write(self, worksheet, fn, *args, **kwargs):
+        try:
+            return call_with_quota(write_limiter, fn, *args, **kwargs)
+        finally:
+            self.invalidate(worksheet)
+
+    def append_row(self, worksheet, row):
+        return self._write(worksheet, worksheet.append_row, row)
+
+    def insert_row(self, worksheet, row, index=2):
+        return self._write(worksheet, worksheet.insert_row, row, index=index)
+
+    def insert_rows(self, worksheet, rows, index=2):
+        return self._write(worksheet, worksheet.insert_rows, rows, row=index)
+
+    def update_row(self, worksheet, row_number, row):
+        return self._write(worksheet, worksheet.update, range_name=row_range(row_number, len(row)), values=[row])
+
+    # rows_by_number maps sheet row -> new values. With expected ({sheet row:
+    # values as read}) the rows are located again first, see locate_rows.
+    def update_rows(self, worksheet, rows_by_number, expected=None):
+        if expected is not None:
+            located = self.locate_rows(worksheet, expected)
+            rows_by_number = {located[number]: row for number, row in rows_by_number.items()}
+        updates = [{'range': row_range(number, len(row)), 'values': [row]} for number, row in rows_by_number.items()]
+        return self._write(worksheet, worksheet.batch_update, updates)
+
+    def append_rows_chunked(self, worksheet, rows, chunk_size=APPEND_CHUNK_ROWS, on_progress=None):
+        try:
+            return append_rows_chunked(worksheet, rows, chunk_size, on_progress)
+        finally:
+            self.invalidate(worksheet)
+
+    # Patch the cached frame now, write to Sheets in the background; returns a Future
+    # send() runs on the writer thread and makes the API call.
+    def _write_behind(self, worksheet, kind, position, row, send, old_row=None):
+        title = worksheet.title
+        with self.lock:
+            base = (self.remote_epoch, self.local_writes.get(title, 0))
+            version = (base[0], base[1] + 1)
+            self.local_writes[title] = version[1]
+            self.pending[title] += 1
+            cached = self.frames.get(title)
+            # Without a current cached frame this is just a write that invalidates
+            if cached is not None and cached[0] == base and _can_patch(cached[1], kind, position, row, old_row):
+                df = cached[1]
+                old_row = df.iloc[position].tolist() if kind == 'update' else None
+                self.frames[title] = (version, _patch_frame(df, kind, position, row))
+                self.patches.setdefault(title, collections.deque(maxlen=PATCH_HISTORY)).append(
+                    Patch(base, version, kind, position, row, old_row))
+
+        def write():
+            try:
+                before = call_with_quota(drive_limiter, self.spreadsheet.get_lastUpdateTime)
+                result = send()
+                after = call_with_quota(drive_limiter, self.spreadsheet.get_lastUpdateTime)
+                with self.lock:
+                    if before == self.remote_modified:
+                        self.remote_modified = after
+                return result
+            except Exception:
+                self.invalidate(worksheet)
+                raise
+            finally:
+                with self.lock:
+                    self.pending[title] -= 1
+
+        return self.writer.submit(write)
+
+    def insert_row_async(self, worksheet, row, index=2):
+        row = [str(value) for value in row]
+        return self._write_behind(worksheet, 'insert', index - 2, row,
+                                  lambda: call_with_quota(write_limiter, worksheet.insert_row, row, index=index))
+
+    # Sheet row of old_row in the cached frame, which already includes queued
+    # writes, when rows were inserted above it since the caller read it
+    def _cached_row_number(self, worksheet, row_number, old_row):
+        with self.lock:
+            cached = self.frames.get(worksheet.title)
+        df = cached[1] if cached is not None else None
+        if df is None or CALLBACK_ID not in df.columns or len(old_row) != len(df.columns):
+            return row_number
+        if 0 <= row_number - 2 < len(df) and df.iloc[row_number - 2].tolist() == old_row:
+            return row_number
+        matches = (df[CALLBACK_ID].to_numpy() == old_row[df.columns.get_loc(CALLBACK_ID)]).nonzero()[0]
+        if len(matches) == 1 and df.iloc[matches[0]].tolist() == old_row:
+            return int(matches[0]) + 2
+        return row_number
+
+    # old_row is the row as the caller read it at row_number. It is located
+    # again right before the write (see locate_rows), so rows inserted since
+    # don't turn this into an overwrite of another callback; a row changed
+    # since fails the write with RowConflict.
+    def update_row_async(self, worksheet, row_number, row, old_row):
+        row = [str(value) for value in row]
+        old_row = [str(value) for value in old_row]
+        row_number = self._cached_row_number(worksheet, row_number, old_row)
+
+        def send():
+            number = self.locate_rows(worksheet, {row_number: old_row})[row_number]
+            return call_with_quota(write_limiter, worksheet.update, range_name=row_range(number, len(row)), values=[row])
+
+        return self._write_behind(worksheet, 'update', row_number - 2, row, send, old_row)
+
+    # Wait until every queued background write has been sent
+    def flush(self):
+        self.writer.submit(lambda: None).result()
+
+
+_stores = weakref.WeakSet()
+
+
+# Wait for the background writes of every store in this process
+def flush_all():
+    for store in list(_stores):
+        store.flush()
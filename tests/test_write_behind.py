@@ -0,0 +1,151 @@
+"""Write-behind edits (SheetStore.insert_row_async/update_row_async) against the
+fake Sheets backend: the patched cache and snapshots must match what a full
+re-read of the sheet gives, and edits must land on the callback they were
+made for, or fail."""
+import datetime
+import random
+
+import gspread
+import pytest
+
+import dataset
+import sheets
+from benchmarks.fake_gspread import FakeBackend, FakeResponse
+from benchmarks.fixtures import agent_rows, make_spreadsheet
+
+AGENTS = [name for name, _ in agent_rows(5)]
+TODAY = str(datetime.date.today())
+
+
+@pytest.fixture(autouse=True)
+def unlimited_quota(monkeypatch):
+    monkeypatch.setattr(sheets, "read_limiter", sheets.RateLimiter(10 ** 9, "read"))
+    monkeypatch.setattr(sheets, "write_limiter", sheets.RateLimiter(10 ** 9, "write"))
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def spreadsheet(backend):
+    return make_spreadsheet(200, len(AGENTS), backend)
+
+
+@pytest.fixture
+def store(spreadsheet):
+    return sheets.SheetStore(spreadsheet)
+
+
+def callback(agent, name, cb_date=TODAY, cb_type="hot"):
+    return [agent, name, "1 Main St", "MCN1", "1960-01-01", "555-0000000", "", "", cb_date, "10:00", cb_type]
+
+
+def sheet_rows(store):
+    return store.callbacks.rows[1:]
+
+
+def rebuilt(store):
+    return dataset.CallbackSnapshot(sheets.get_df(store.callbacks))
+
+
+def assert_same_snapshot(snapshot, full):
+    assert snapshot.df.values.tolist() == full.df.values.tolist()
+    assert {name: rows.tolist() for name, rows in snapshot.agent_rows.items() if len(rows)} == \
+        {name: rows.tolist() for name, rows in full.agent_rows.items()}
+    for agent in AGENTS:
+        patched, recomputed = snapshot.agent_stats(agent), full.agent_stats(agent)
+        assert (patched.total, patched.due_today, patched.score_total) == \
+            (recomputed.total, recomputed.due_today, recomputed.score_total), agent
+
+
+def test_patched_snapshots_match_full_rebuild(store, backend):
+    rng = random.Random(0)
+    snapshot = dataset.get_snapshot(store)
+    for agent in AGENTS:
+        snapshot.agent_stats(agent)
+    for step in range(60):
+        row = callback(rng.choice(AGENTS), f"Client X{step}", rng.choice([TODAY, "2020-01-01"]),
+                       rng.choice(["cold", "warm", "hot", "unknown"]))
+        if rng.random() < 0.4:
+            store.insert_row_async(store.callbacks, row + [sheets.new_callback_id()], index=rng.randint(2, len(snapshot) + 2))
+        else:
+            number = rng.randint(2, len(snapshot) + 1)
+            old_row = snapshot.df.iloc[number - 2].tolist()
+            store.update_row_async(store.callbacks, number, row + [old_row[-1]], old_row)
+        snapshot = dataset.get_snapshot(store)
+    store.flush()
+
+    # Every snapshot after the first came from patches, not from reading the sheet
+    assert backend.calls["get_all_values"] == 1
+    assert_same_snapshot(dataset.get_snapshot(store), rebuilt(store))
+
+
+@pytest.mark.parametrize("inserted_by", ["same store", "other process"])
+def test_edit_finds_its_row_after_an_insert_above(store, spreadsheet, monkeypatch, inserted_by):
+    # Check Drive on every call, so an insert by the other store is seen at once
+    monkeypatch.setattr(sheets, "VERSION_CHECK_SECONDS", 0)
+    snapshot = dataset.get_snapshot(store)
+    old_row = snapshot.df.iloc[2].tolist()
+    above = snapshot.df.iloc[1].tolist()
+
+    inserter = store if inserted_by == "same store" else sheets.SheetStore(spreadsheet)
+    inserter.insert_row_async(inserter.callbacks, callback(AGENTS[0], "Client New") + [sheets.new_callback_id()]).result()
+    # Edit row 4 as read, though that callback has moved down to row 5
+    new_row = callback(old_row[0], "Client Edited") + [old_row[-1]]
+    store.update_row_async(store.callbacks, 4, new_row, old_row).result()
+
+    rows = sheet_rows(store)
+    assert rows[3] == new_row
+    assert rows[2] == above
+    assert_same_snapshot(dataset.get_snapshot(store), rebuilt(store))
+
+
+def test_edit_conflicts_when_the_row_changed_elsewhere(store, spreadsheet):
+    snapshot = dataset.get_snapshot(store)
+    old_row = snapshot.df.iloc[0].tolist()
+    theirs = callback(old_row[0], "Client Theirs") + [old_row[-1]]
+    other = sheets.SheetStore(spreadsheet)
+    other.update_row(other.callbacks, 2, theirs)
+
+    write = store.update_row_async(store.callbacks, 2, callback(old_row[0], "Client Ours") + [old_row[-1]], old_row)
+    with pytest.raises(sheets.RowConflict):
+        write.result()
+    assert sheet_rows(store)[0] == theirs
+    # The optimistic edit is dropped: the next read shows the sheet as it is
+    assert store.frame(store.callbacks).iloc[0].tolist() == theirs
+
+
+def test_failed_write_invalidates_the_cache(store, backend, monkeypatch):
+    before = store.frame(store.callbacks)
+
+    def insert_row(values, index=1, **kwargs):
+        raise gspread.exceptions.APIError(FakeResponse(500, "Backend error"))
+
+    monkeypatch.setattr(store.callbacks, "insert_row", insert_row)
+    write = store.insert_row_async(store.callbacks, callback(AGENTS[0], "Client Lost") + [sheets.new_callback_id()])
+    with pytest.raises(gspread.exceptions.APIError):
+        write.result()
+
+    reads = backend.calls["get_all_values"]
+    after = store.frame(store.callbacks)
+    assert backend.calls["get_all_values"] == reads + 1
+    assert after.values.tolist() == before.values.tolist()
+
+
+@pytest.mark.parametrize("writes, patched", [(sheets.PATCH_HISTORY, True), (sheets.PATCH_HISTORY + 1, False)])
+def test_patch_chain_falls_back_to_full_rebuild(store, writes, patched):
+    first = dataset.get_snapshot(store)
+    for agent in AGENTS:
+        first.agent_stats(agent)
+    for i in range(writes):
+        store.insert_row_async(store.callbacks, callback(AGENTS[i % len(AGENTS)], f"Client P{i}") + [sheets.new_callback_id()])
+    store.flush()
+
+    version = store.version(store.callbacks)
+    assert (store.patches_since(store.callbacks, first.version, version) is not None) == patched
+    snapshot = dataset.get_snapshot(store)
+    # Patched snapshots carry the stats over; full rebuilds start without any
+    assert bool(snapshot.stats) == patched
+    assert_same_snapshot(snapshot, rebuilt(store))